@@ -0,0 +1,380 @@
+"""
+涨停数据HTTP接口服务（无界面）
+
+与Streamlit界面并行运行，向告警机器人、下单工具等下游系统提供与 main.py 相同的数据：
+- GET /api/limit_up?date=YYYYMMDD      连续涨停股票（get_continuous_limit_up_stocks）
+- GET /api/one_to_two?date=YYYYMMDD    反包候选股票（get_one_to_two_candidates，仅最近一个交易日）
+- GET /api/analysis?date=YYYYMMDD      已缓存的AI分析结果（界面中完成分析后自动保存）
+
+返回格式通过 format=json|arrow 参数或 Accept 头选择（Arrow IPC 流格式），
+支持 ETag/If-None-Match 和 gzip 压缩。数据先从本地缓存读取，同一日期同一时间
+只会向问财发起一次请求，多个客户端共享同一份结果。问财获取失败时返回502。
+
+运行方式：
+    python api_server.py --host 0.0.0.0 --port 8600
+"""
+import argparse
+import functools
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pyarrow as pa
+
+import main as app
+
+# 本地缓存目录，与 main.py 的AI分析缓存放在同一处
+DATA_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'data')
+# 盘中数据会变化，缓存有效期（秒）；在该交易日收盘后获取的数据不再变化，长期有效
+TODAY_CACHE_TTL = 60
+# 收盘时间为15:00，留出问财更新数据的时间，此后获取的数据才视为最终结果
+MARKET_SETTLED_TIME = '16:00'
+# 获取失败时的缓存有效期（秒），避免短时间内反复请求问财
+FAILED_CACHE_TTL = 10
+# 小于该字节数的响应不压缩
+GZIP_MIN_SIZE = 1024
+
+ARROW_MIME = 'application/vnd.apache.arrow.stream'
+
+# 数据集名称 -> 获取函数
+DATASETS = {
+    'limit_up': app.get_continuous_limit_up_stocks,
+    'one_to_two': app.get_one_to_two_candidates,
+}
+# 只能获取当前交易日数据的数据集：不接受历史日期，也不长期缓存
+LIVE_DATASETS = {'one_to_two'}
+
+
+class CacheEntry:
+    """一份数据快照及其已序列化的各种响应体"""
+
+    def __init__(self, df, expires_at, error=None):
+        self.df = df
+        self.expires_at = expires_at
+        self.error = error
+        self.etag = None
+        self.bodies = {}
+        self.lock = threading.Lock()
+
+    def is_fresh(self):
+        return self.expires_at is None or time.time() < self.expires_at
+
+    def get_body(self, fmt, use_gzip):
+        """获取指定格式的响应体，序列化和压缩结果都会缓存，每份快照只做一次"""
+        key = (fmt, use_gzip)
+        with self.lock:
+            if key not in self.bodies:
+                if use_gzip:
+                    self.bodies[key] = gzip.compress(self._serialize(fmt), compresslevel=6)
+                else:
+                    self.bodies[key] = self._serialize(fmt)
+            return self.bodies[key]
+
+    def _serialize(self, fmt):
+        if (fmt, False) in self.bodies:
+            return self.bodies[(fmt, False)]
+        if fmt == 'arrow':
+            body = dataframe_to_arrow(self.df)
+        else:
+            body = dataframe_to_json(self.df)
+        self.bodies[(fmt, False)] = body
+        return body
+
+
+class SnapshotCache:
+    """按（数据集, 日期）缓存数据快照，并保证同一键同时只有一个上游请求"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.entries = {}
+        self.key_locks = {}
+        self.lock = threading.Lock()
+
+    def _key_lock(self, key):
+        with self.lock:
+            if key not in self.key_locks:
+                self.key_locks[key] = threading.Lock()
+            return self.key_locks[key]
+
+    def _disk_path(self, dataset, date):
+        return os.path.join(self.cache_dir, f"{dataset}_{date}.arrow")
+
+    def get(self, dataset, date):
+        key = (dataset, date)
+        entry = self.entries.get(key)
+        if entry is not None and entry.is_fresh():
+            return entry
+
+        # 同一键的请求在此排队，第一个请求完成获取后其余请求直接使用缓存
+        with self._key_lock(key):
+            entry = self.entries.get(key)
+            if entry is not None and entry.is_fresh():
+                return entry
+            entry = self._load_from_disk(dataset, date)
+            if entry is None:
+                entry = self._fetch(dataset, date)
+            self.entries[key] = entry
+            return entry
+
+    def _load_from_disk(self, dataset, date):
+        path = self._disk_path(dataset, date)
+        if not os.path.exists(path):
+            return None
+        # 只有收盘后获取的数据会落盘，文件时间不满足时说明是盘中数据，需要重新获取
+        expires_at = cache_expires_at(dataset, date, os.path.getmtime(path))
+        if expires_at is not None:
+            return None
+        try:
+            with pa.memory_map(path, 'r') as source:
+                df = pa.ipc.open_stream(source).read_all().to_pandas()
+        except (OSError, pa.ArrowInvalid):
+            return None
+        # 空结果不应长期有效，重新获取
+        if len(df) == 0:
+            return None
+        return CacheEntry(df, expires_at)
+
+    def _fetch(self, dataset, date):
+        df = DATASETS[dataset](date)
+        if df is None:
+            # 获取失败不落盘，短时间后重试
+            return CacheEntry(None, time.time() + FAILED_CACHE_TTL, error=f"{date} 问财数据获取失败")
+
+        df = df.reset_index(drop=True)
+        if len(df) == 0:
+            # 空结果可能是上游异常返回，只短期缓存，不落盘
+            return CacheEntry(df, time.time() + TODAY_CACHE_TTL)
+        entry = CacheEntry(df, cache_expires_at(dataset, date, time.time()))
+        if entry.expires_at is not None:
+            return entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._disk_path(dataset, date)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(entry.get_body('arrow', False))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"写入本地缓存失败: {e}")
+        return entry
+
+
+def cache_expires_at(dataset, date, fetched_at):
+    """计算缓存过期时间：该交易日收盘后获取的数据返回None（长期有效），其余按TTL过期"""
+    if dataset not in LIVE_DATASETS:
+        settled_at = datetime.strptime(f"{date} {MARKET_SETTLED_TIME}", '%Y%m%d %H:%M').timestamp()
+        if fetched_at >= settled_at:
+            return None
+    return fetched_at + TODAY_CACHE_TTL
+
+
+def dataframe_to_json(df):
+    records = json.loads(df.to_json(orient='records', force_ascii=False)) if len(df) else []
+    return json.dumps({'count': len(records), 'data': records}, ensure_ascii=False).encode('utf-8')
+
+
+def dataframe_to_arrow(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def normalize_date(date):
+    """将日期参数统一为YYYYMMDD格式，格式不正确或不是有效日期时返回None"""
+    date = date.replace('-', '')
+    if not re.fullmatch(r'\d{8}', date):
+        return None
+    try:
+        datetime.strptime(date, '%Y%m%d')
+    except ValueError:
+        return None
+    return date
+
+
+def latest_trading_day():
+    """获取最近一个交易日（YYYYMMDD），与界面默认选择的日期一致"""
+    return _latest_trading_day(datetime.now().strftime('%Y%m%d'))
+
+
+@functools.lru_cache(maxsize=4)
+def _latest_trading_day(today):
+    end_date = datetime.strptime(today, '%Y%m%d')
+    start_date = end_date - timedelta(days=30)
+    trading_days = app.get_trading_days(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+    if not trading_days:
+        return end_date.strftime('%Y%m%d')
+    return trading_days[-1].replace('-', '')
+
+
+def etag_matches(if_none_match, etag):
+    """判断If-None-Match头是否命中当前ETag（弱比较）"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag[2:]:
+            return True
+    return False
+
+
+snapshot_cache = SnapshotCache(DATA_CACHE_DIR)
+
+# AI分析结果按（日期, 文件修改时间）缓存
+analysis_entries = {}
+analysis_lock = threading.Lock()
+
+
+def get_analysis_entry(date):
+    cache_path = app.get_analysis_cache_path(date)
+    if not os.path.exists(cache_path):
+        return None
+    mtime = os.path.getmtime(cache_path)
+    with analysis_lock:
+        cached = analysis_entries.get(date)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        analysis_text = app.load_analysis_result(date)
+        if analysis_text is None:
+            return None
+        entry = CacheEntry(pd.DataFrame([{'date': date, 'analysis': analysis_text}]), None)
+        analysis_entries[date] = (mtime, entry)
+        return entry
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = 'LimitUpAPI/1.0'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        name = url.path.rstrip('/').rsplit('/', 1)[-1]
+
+        if url.path.rstrip('/') not in ('/api/limit_up', '/api/one_to_two', '/api/analysis'):
+            self.send_error_json(404, f"未知接口: {url.path}")
+            return
+
+        date = params.get('date', [None])[0]
+        if date:
+            date = normalize_date(date)
+            if date is None:
+                self.send_error_json(400, "日期格式错误，应为YYYYMMDD或YYYY-MM-DD")
+                return
+        else:
+            date = latest_trading_day()
+
+        if name in LIVE_DATASETS and date != latest_trading_day():
+            self.send_error_json(400, f"{name} 只支持最近一个交易日（{latest_trading_day()}）的数据")
+            return
+
+        fmt = self.negotiate_format(params)
+        if fmt is None:
+            self.send_error_json(400, "format参数仅支持json或arrow")
+            return
+
+        cache_control = None
+        try:
+            if name == 'analysis':
+                entry = get_analysis_entry(date)
+                if entry is None:
+                    self.send_error_json(404, f"{date} 暂无AI分析结果")
+                    return
+                # 重新分析会覆盖结果，客户端每次都需用ETag重新验证
+                cache_control = 'no-cache'
+            else:
+                entry = snapshot_cache.get(name, date)
+        except Exception as e:
+            self.send_error_json(500, f"获取数据时出错: {e}")
+            return
+
+        if entry.error is not None:
+            self.send_error_json(502, entry.error)
+            return
+
+        self.send_entry(entry, fmt, cache_control)
+
+    def negotiate_format(self, params):
+        fmt = params.get('format', [None])[0]
+        if fmt is None:
+            return 'arrow' if ARROW_MIME in self.headers.get('Accept', '') else 'json'
+        if fmt in ('json', 'arrow'):
+            return fmt
+        return None
+
+    def send_entry(self, entry, fmt, cache_control=None):
+        if entry.etag is None:
+            entry.etag = hashlib.sha1(entry.get_body('arrow', False)).hexdigest()
+        # 同一快照在不同格式/编码下内容等价，使用弱ETag
+        etag = f'W/"{entry.etag}-{fmt}"'
+        if cache_control is None:
+            if entry.expires_at is None:
+                cache_control = 'public, max-age=86400'
+            else:
+                # 下游缓存时间不超过本地快照的剩余有效期
+                cache_control = f'public, max-age={max(0, int(entry.expires_at - time.time()))}'
+
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self.send_header('Vary', 'Accept, Accept-Encoding')
+            self.end_headers()
+            return
+
+        use_gzip = ('gzip' in self.headers.get('Accept-Encoding', '')
+                    and len(entry.get_body(fmt, False)) >= GZIP_MIN_SIZE)
+        body = entry.get_body(fmt, use_gzip)
+
+        self.send_response(200)
+        if fmt == 'arrow':
+            self.send_header('Content-Type', ARROW_MIME)
+        else:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('Vary', 'Accept, Accept-Encoding')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message):
+        body = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def run_server(host='127.0.0.1', port=8600):
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    print(f"涨停数据接口服务已启动: http://{host}:{port}/api/limit_up")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="涨停数据HTTP接口服务")
+    parser.add_argument('--host', default='127.0.0.1', help="监听地址")
+    parser.add_argument('--port', type=int, default=8600, help="监听端口")
+    args = parser.parse_args()
+    run_server(args.host, args.port)
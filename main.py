@@ -8,13 +8,18 @@ from datetime import datetime, timedelta
 from openai import OpenAI
 import time
 import os
+import re
+import math
+import hashlib
 import tempfile
+import threading
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle, Image
 from reportlab.lib.units import inch, cm
 import base64
+from xml.sax.saxutils import escape
 # 添加中文字体支持
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
@@ -51,7 +56,7 @@ def get_trading_days(start_date, end_date):
 
 # 获取连续涨停股票数据
 def get_continuous_limit_up_stocks(date=None):
-    """获取指定日期的连续涨停股票数据"""
+    """获取指定日期的连续涨停股票数据，没有数据时返回空表，获取失败时返回None"""
     if date is None:
         date = datetime.now().strftime('%Y%m%d')  # 使用YYYYMMDD格式
     else:
@@ -64,9 +69,12 @@ def get_continuous_limit_up_stocks(date=None):
         query = f"非ST，{date}连续涨停天数排序,概念"
         data = pywencai.get(query=query)
         
-        if data is None or len(data) == 0:
-            st.info(f"{date} 没有获取到数据")
+        if data is None:
+            st.error(f"{date} 问财数据获取失败")
             return None
+        if len(data) == 0:
+            st.info(f"{date} 没有获取到数据")
+            return pd.DataFrame(columns=['code', 'name', 'industry', 'limit_up_days'])
         
         # 打印列名，帮助调试
         st.write("获取到的数据列名:", list(data.columns))
@@ -124,10 +132,9 @@ def get_continuous_limit_up_stocks(date=None):
         # 过滤掉非连续涨停的股票
         processed_data = processed_data[processed_data['limit_up_days'] >= 1]  # 包含首板
         
-        # 如果数据为空，返回None
+        # 如果数据为空，返回空表
         if len(processed_data) == 0:
             st.info(f"{date} 没有连续涨停的股票")
-            return None
             
         return processed_data
     
@@ -204,7 +211,40 @@ def analyze_industry_leaders(stocks_df):
         st.error(f"AI分析时出错: {e}")
         import traceback
         st.error(traceback.format_exc())  # 打印详细错误信息
-        return "AI分析失败，请稍后再试。"
+        return ANALYSIS_FAILED_TEXT
+
+# AI分析结果缓存目录（按日期保存，供 api_server.py 等下游服务读取）
+ANALYSIS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'analysis')
+ANALYSIS_FAILED_TEXT = "AI分析失败，请稍后再试。"
+
+def get_analysis_cache_path(date):
+    """获取指定日期AI分析结果的缓存文件路径"""
+    return os.path.join(ANALYSIS_CACHE_DIR, f"analysis_{date.replace('-', '')}.md")
+
+# 保存AI分析结果
+def save_analysis_result(date, analysis_text):
+    """按日期将AI分析结果写入本地缓存，分析失败的结果不保存"""
+    if not analysis_text or analysis_text == ANALYSIS_FAILED_TEXT:
+        return
+    try:
+        os.makedirs(ANALYSIS_CACHE_DIR, exist_ok=True)
+        cache_path = get_analysis_cache_path(date)
+        # 先写临时文件再替换，避免读取方读到写了一半的内容
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(analysis_text)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        st.warning(f"保存AI分析结果缓存失败: {e}")
+
+# 读取AI分析结果
+def load_analysis_result(date):
+    """读取指定日期缓存的AI分析结果，没有缓存时返回None"""
+    cache_path = get_analysis_cache_path(date)
+    if not os.path.exists(cache_path):
+        return None
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        return f.read()
 
 # 可视化连续涨停数据
 def visualize_limit_up_data(stocks_df, date):
@@ -240,6 +280,165 @@ def visualize_limit_up_data(stocks_df, date):
     
     return fig_pie, fig_bar
 
+# Markdown解析用的正则表达式
+MD_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+MD_LIST_RE = re.compile(r'^\s*(?:[-*+]|(\d+)[.)])\s+(.*)$')
+MD_TABLE_SEPARATOR_RE = re.compile(r'^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$')
+MD_HR_RE = re.compile(r'^([-*_])(\s*\1){2,}$')
+
+def format_markdown_inline(text):
+    """将行内Markdown转换为reportlab段落标记：转义特殊字符，处理粗斜体、加粗、斜体和行内代码"""
+    # 按行内代码拆分，奇数位置为代码内容，原样保留
+    parts = re.split(r'`([^`]+)`', escape(text))
+    for i in range(0, len(parts), 2):
+        part = parts[i]
+        part = re.sub(r'\*\*\*(.+?)\*\*\*', r'<b><i>\1</i></b>', part)
+        part = re.sub(r'___(.+?)___', r'<b><i>\1</i></b>', part)
+        part = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', part)
+        part = re.sub(r'__(.+?)__', r'<b>\1</b>', part)
+        # 斜体标记内侧不能是空白，下划线两侧不能紧挨字母数字，避免误处理乘号和变量名
+        part = re.sub(r'\*(?!\s)([^*]+?)(?<!\s)\*', r'<i>\1</i>', part)
+        part = re.sub(r'(?<![A-Za-z0-9_])_(?!\s)([^_]+?)(?<!\s)_(?![A-Za-z0-9_])', r'<i>\1</i>', part)
+        parts[i] = part
+    return ''.join(parts)
+
+def split_markdown_table_row(line):
+    """拆分Markdown表格行为单元格列表"""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    return [format_markdown_inline(cell.strip()) for cell in line.split('|')]
+
+# 解析AI分析文本
+def parse_analysis_markdown(analysis_text):
+    """将AI分析的Markdown文本解析为由标题、段落、列表和表格组成的中间结构
+    
+    返回由以下几种块组成的元组：
+    - ('heading', 级别, 文本)
+    - ('paragraph', 文本)
+    - ('list', 是否有序, (列表项, ...))
+    - ('table', ((表头单元格, ...), (单元格, ...), ...))
+    """
+    blocks = []
+    paragraph_lines = []
+    list_items = []
+    list_ordered = False
+    table_rows = []
+    table_separator_pending = False
+    
+    def flush():
+        # 将正在累积的段落、列表或表格输出为一个块
+        if paragraph_lines:
+            blocks.append(('paragraph', format_markdown_inline(' '.join(paragraph_lines))))
+            paragraph_lines.clear()
+        if list_items:
+            blocks.append(('list', list_ordered, tuple(list_items)))
+            list_items.clear()
+        if table_rows:
+            col_count = max(len(row) for row in table_rows)
+            blocks.append(('table', tuple(tuple(row + [''] * (col_count - len(row))) for row in table_rows)))
+            table_rows.clear()
+    
+    for line in analysis_text.split('\n'):
+        stripped = line.strip()
+        
+        # 处理表格：只有表头下的第二行是分隔行，其他全为“-”的行是以“-”表示空值的数据行
+        if stripped.startswith('|') and '|' in stripped[1:]:
+            if not table_rows:
+                flush()
+                table_separator_pending = True
+            elif table_separator_pending:
+                table_separator_pending = False
+                if MD_TABLE_SEPARATOR_RE.match(stripped):
+                    continue
+            table_rows.append(split_markdown_table_row(stripped))
+            continue
+        if table_rows:
+            flush()
+        
+        # 处理空行和分隔线
+        if stripped == "" or MD_HR_RE.match(stripped):
+            flush()
+            continue
+        
+        # 处理标题
+        heading_match = MD_HEADING_RE.match(stripped)
+        if heading_match:
+            flush()
+            blocks.append(('heading', len(heading_match.group(1)), format_markdown_inline(heading_match.group(2))))
+            continue
+        
+        # 处理列表
+        list_match = MD_LIST_RE.match(line)
+        if list_match:
+            ordered = list_match.group(1) is not None
+            if paragraph_lines or (list_items and ordered != list_ordered):
+                flush()
+            list_ordered = ordered
+            list_items.append(format_markdown_inline(list_match.group(2).strip()))
+            continue
+        
+        # 处理普通段落（列表项的续行并入上一个列表项）
+        if list_items:
+            list_items[-1] += ' ' + format_markdown_inline(stripped)
+        else:
+            paragraph_lines.append(stripped)
+    
+    flush()
+    return tuple(blocks)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_cached_analysis_tree(content_hash, _analysis_text):
+    """按内容哈希缓存解析结果，_analysis_text不参与缓存键的计算"""
+    return parse_analysis_markdown(_analysis_text)
+
+def get_analysis_tree(analysis_text):
+    """获取AI分析文本的解析结果，同一内容只解析一次"""
+    content_hash = hashlib.sha256(analysis_text.encode('utf-8')).hexdigest()
+    return get_cached_analysis_tree(content_hash, analysis_text)
+
+# 将解析结果转换为PDF内容
+def build_analysis_flowables(analysis_tree, styles, body_style, available_width):
+    """将AI分析的中间结构渲染为reportlab的段落、列表和表格"""
+    flowables = []
+    list_style = ParagraphStyle('analysis_list', parent=body_style, leftIndent=18, bulletIndent=6, spaceAfter=2)
+    cell_style = ParagraphStyle('analysis_cell', parent=body_style, fontSize=9, leading=12, wordWrap='CJK')
+    header_cell_style = ParagraphStyle('analysis_header_cell', parent=cell_style, alignment=1)
+    
+    for block in analysis_tree:
+        kind = block[0]
+        if kind == 'heading':
+            level, text = block[1], block[2]
+            flowables.append(Paragraph(text, styles[f'Heading{min(level, 3)}']))
+            flowables.append(Spacer(1, 0.3*cm if level == 1 else 0.2*cm))
+        elif kind == 'paragraph':
+            flowables.append(Paragraph(block[1], body_style))
+            flowables.append(Spacer(1, 0.2*cm))
+        elif kind == 'list':
+            ordered, items = block[1], block[2]
+            for i, item in enumerate(items, 1):
+                flowables.append(Paragraph(item, list_style, bulletText=f'{i}.' if ordered else '•'))
+            flowables.append(Spacer(1, 0.2*cm))
+        elif kind == 'table':
+            rows = block[1]
+            col_count = len(rows[0])
+            table_data = [[Paragraph(cell, header_cell_style) for cell in rows[0]]]
+            table_data += [[Paragraph(cell, cell_style) for cell in row] for row in rows[1:]]
+            # 固定列宽并使用LongTable，大表格无需反复计算列宽即可一次完成布局
+            table = LongTable(table_data, colWidths=[available_width / col_count] * col_count, repeatRows=1)
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ]))
+            flowables.append(table)
+            flowables.append(Spacer(1, 0.3*cm))
+    
+    return flowables
+
 # 生成PDF报告
 def generate_pdf_report(stocks_df, date, analysis_text):
     """生成PDF分析报告 - 使用表格代替图表"""
@@ -379,57 +578,9 @@ def generate_pdf_report(stocks_df, date, analysis_text):
         content.append(Paragraph("DeepSeek AI 分析结果", subtitle_style))
         content.append(Spacer(1, 0.3*cm))
         
-        # 处理Markdown格式的分析文本
-        # 简单处理：按行分割，识别标题和段落
-        lines = analysis_text.split('\n')
-        current_paragraph = ""
-        
-        for line in lines:
-            # 处理标题
-            if line.startswith('# '):
-                if current_paragraph:
-                    content.append(Paragraph(current_paragraph, body_style))
-                    content.append(Spacer(1, 0.2*cm))
-                    current_paragraph = ""
-                content.append(Paragraph(line[2:], styles['Heading1']))
-                content.append(Spacer(1, 0.3*cm))
-            elif line.startswith('## '):
-                if current_paragraph:
-                    content.append(Paragraph(current_paragraph, body_style))
-                    content.append(Spacer(1, 0.2*cm))
-                    current_paragraph = ""
-                content.append(Paragraph(line[3:], styles['Heading2']))
-                content.append(Spacer(1, 0.2*cm))
-            elif line.startswith('### '):
-                if current_paragraph:
-                    content.append(Paragraph(current_paragraph, body_style))
-                    content.append(Spacer(1, 0.2*cm))
-                    current_paragraph = ""
-                content.append(Paragraph(line[4:], styles['Heading3']))
-                content.append(Spacer(1, 0.2*cm))
-            # 处理表格（简化处理）
-            elif line.startswith('|') and '|' in line[1:]:
-                if current_paragraph:
-                    content.append(Paragraph(current_paragraph, body_style))
-                    content.append(Spacer(1, 0.2*cm))
-                    current_paragraph = ""
-                content.append(Paragraph(line, body_style))
-            # 处理空行
-            elif line.strip() == "":
-                if current_paragraph:
-                    content.append(Paragraph(current_paragraph, body_style))
-                    content.append(Spacer(1, 0.2*cm))
-                    current_paragraph = ""
-            # 处理普通段落
-            else:
-                if current_paragraph:
-                    current_paragraph += " " + line
-                else:
-                    current_paragraph = line
-        
-        # 添加最后一个段落
-        if current_paragraph:
-            content.append(Paragraph(current_paragraph, body_style))
+        # AI分析文本按内容哈希缓存解析结果，重新生成同一报告时不再解析
+        analysis_tree = get_analysis_tree(analysis_text)
+        content.extend(build_analysis_flowables(analysis_tree, styles, body_style, doc.width))
     
     # 构建PDF
     doc.build(content)
@@ -464,9 +615,164 @@ def get_pdf_download_link(pdf_path, filename):
     
     return download_button_str
 
+# 分页表格默认每页行数
+TABLE_PAGE_SIZE = 50
+# 支持搜索的列：代码、名称、概念
+TABLE_SEARCH_COLUMNS = ('code', 'name', 'industry')
+
+# 连续涨停股票表格的列名配置
+LIMIT_UP_COLUMN_CONFIG = {
+    'code': '股票代码',
+    'name': '股票名称',
+    'industry': '所属概念',
+    'limit_up_days': '连续涨停天数'
+}
+
+# 连续涨停股票表格的组合排序：按概念分组，组内按连续涨停天数降序
+LIMIT_UP_SORT_PRESETS = {
+    '按概念分组': (['industry', 'limit_up_days'], [True, False])
+}
+
+# 表格快照：同一份数据在多次重新运行之间复用排序索引和筛选结果
+class TableSnapshot:
+    """表格数据快照，缓存排序索引、搜索文本和筛选结果"""
+
+    def __init__(self, df, search_columns):
+        self.df = df.reset_index(drop=True)
+        # 搜索文本：将代码、名称、概念拼接并转为小写，搜索时只需一次向量化匹配
+        search_text = pd.Series('', index=self.df.index)
+        for col in search_columns:
+            search_text = search_text + '|' + self.df[col].astype(str).str.lower()
+        self.search_text = search_text
+        # 概念列表：所属概念字段为以分号分隔的多个概念
+        if 'industry' in self.df.columns:
+            self.concept_sets = self.df['industry'].astype(str).map(
+                lambda value: frozenset(c.strip() for c in re.split(r'[;；]', value) if c.strip())
+            )
+            self.concepts = sorted(set().union(*self.concept_sets)) if len(self.df) else []
+        else:
+            self.concept_sets = None
+            self.concepts = []
+        self.orders = {}
+        self.masks = {}
+        # 快照通过st.cache_resource在所有会话间共享，修改缓存时需要加锁
+        self.lock = threading.Lock()
+
+    def get_order(self, sort_by, ascending):
+        """获取排序后的行位置，每种排序方式只计算一次"""
+        key = (tuple(sort_by), tuple(ascending))
+        order = self.orders.get(key)
+        if order is None:
+            sorted_df = self.df.sort_values(list(sort_by), ascending=list(ascending), kind='mergesort', na_position='last')
+            order = sorted_df.index.to_numpy()
+            with self.lock:
+                self.orders[key] = order
+        return order
+
+    def get_mask(self, search, concepts):
+        """获取搜索和概念筛选结果（布尔数组），没有筛选条件时返回None"""
+        if not search and not concepts:
+            return None
+        key = (search, concepts)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = pd.Series(True, index=self.df.index)
+            if search:
+                mask &= self.search_text.str.contains(search.lower(), regex=False)
+            if concepts and self.concept_sets is not None:
+                selected = frozenset(concepts)
+                mask &= self.concept_sets.map(lambda value: not value.isdisjoint(selected))
+            mask = mask.to_numpy()
+            with self.lock:
+                # 搜索词随输入变化，限制缓存数量
+                if len(self.masks) >= 64:
+                    self.masks.clear()
+                self.masks[key] = mask
+        return mask
+
+    def query(self, sort_by, ascending, search='', concepts=()):
+        """返回排序并筛选后的行位置"""
+        order = self.get_order(sort_by, ascending)
+        mask = self.get_mask(search, concepts)
+        if mask is None:
+            return order
+        return order[mask[order]]
+
+def get_table_snapshot_id(df):
+    """根据表格内容计算快照ID，内容相同的数据得到相同的ID"""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_table_snapshot(snapshot_id, _df, search_columns):
+    """按快照ID缓存表格快照，_df不参与缓存键的计算"""
+    return TableSnapshot(_df, search_columns)
+
+# 分页表格
+def render_paged_table(df, key, column_config, sort_by, ascending, sort_presets=None, page_size=TABLE_PAGE_SIZE):
+    """分页显示表格：在服务端排序、筛选和搜索，只将当前页发送到浏览器
+    
+    sort_presets为{名称: (排序列列表, 升序列表)}，作为多列组合排序选项加入排序下拉框
+    """
+    sort_presets = sort_presets or {}
+    columns = list(column_config.keys())
+    df = df[columns]
+    snapshot_id = get_table_snapshot_id(df)
+    search_columns = tuple(col for col in TABLE_SEARCH_COLUMNS if col in columns)
+    snapshot = get_table_snapshot(snapshot_id, df, search_columns)
+    
+    # 搜索、筛选和排序控件
+    col_search, col_filter, col_sort, col_order = st.columns([3, 3, 2, 1])
+    with col_search:
+        search = st.text_input("搜索代码/名称/概念", key=f"{key}_search").strip()
+    with col_filter:
+        if snapshot.concepts:
+            concepts = tuple(st.multiselect("概念筛选", snapshot.concepts, key=f"{key}_concepts"))
+        else:
+            concepts = ()
+    column_labels = [column_config[col] for col in columns]
+    with col_sort:
+        sort_label = st.selectbox("排序", options=['默认'] + list(sort_presets) + column_labels, key=f"{key}_sort")
+    sort_col = columns[column_labels.index(sort_label)] if sort_label in column_labels else None
+    with col_order:
+        # 默认排序和组合排序自带升降序，此时不使用顺序选项
+        sort_desc = st.selectbox("顺序", options=['降序', '升序'], key=f"{key}_order", disabled=sort_col is None) == '降序'
+    
+    if sort_col is not None:
+        sort_by, ascending = [sort_col], [not sort_desc]
+    elif sort_label in sort_presets:
+        sort_by, ascending = sort_presets[sort_label]
+    positions = snapshot.query(sort_by, ascending, search, concepts)
+    
+    # 搜索、筛选或排序条件变化时回到第一页；总页数变少时将页码调整到有效范围内
+    total = len(positions)
+    page_count = max(1, math.ceil(total / page_size))
+    page_key = f"{key}_page"
+    view_key = f"{key}_view"
+    view = (search, concepts, sort_label, sort_desc if sort_col is not None else None)
+    if page_key not in st.session_state or st.session_state.get(view_key) != view:
+        st.session_state[page_key] = 1
+    elif st.session_state[page_key] > page_count:
+        st.session_state[page_key] = page_count
+    st.session_state[view_key] = view
+    page = st.session_state[page_key]
+    
+    page_df = snapshot.df.iloc[positions[(page - 1) * page_size:page * page_size]]
+    st.dataframe(page_df, use_container_width=True, hide_index=True, column_config=column_config)
+    
+    col_info, col_page = st.columns([3, 1])
+    with col_page:
+        st.number_input("页码", min_value=1, max_value=page_count, step=1, key=page_key)
+    with col_info:
+        st.caption(f"共 {total} 条记录，第 {page}/{page_count} 页，每页 {page_size} 条")
+
 # 获取一进二股票数据
 def get_one_to_two_candidates(date=None):
-    """获取一进二（昨日首板，今日大概率进2板）股票数据"""
+    """获取一进二（昨日首板，今日大概率进2板）股票数据，没有数据时返回空表，获取失败时返回None
+    
+    注意：问财查询使用“今日/昨日”，只能获取当前交易日的数据，date仅用于匹配返回的列名
+    """
     if date is None:
         today = datetime.now().strftime('%Y%m%d')
     else:
@@ -475,8 +781,11 @@ def get_one_to_two_candidates(date=None):
     query = f"沪深主板，非st，前日涨停，昨日未涨停，今日竞价涨幅，今日竞价量，昨日成交量"
     try:
         data = pywencai.get(query=query)
-        if data is None or len(data) == 0:
+        if data is None:
+            st.error("反包数据获取失败")
             return None
+        if len(data) == 0:
+            return pd.DataFrame(columns=['code', 'name', 'open_rise', 'today_vol', 'yest_vol', '竞昨比', '进2板概率'])
         # 字段名严格按问财返回
         code_col = '股票代码'
         name_col = '股票简称'
@@ -514,6 +823,40 @@ def get_one_to_two_candidates(date=None):
         st.error(traceback.format_exc())
         return None
 
+# 界面数据缓存有效期（秒）：表格翻页、排序、搜索等交互会重新运行脚本，此时不再重复查询问财
+UI_DATA_CACHE_TTL = 60
+
+class DataFetchError(Exception):
+    """问财数据获取失败，抛出异常使失败结果不被st.cache_data缓存"""
+
+@st.cache_data(ttl=UI_DATA_CACHE_TTL, show_spinner=False)
+def load_continuous_limit_up_stocks(date):
+    """按日期缓存的连续涨停数据，供界面使用"""
+    stocks_df = get_continuous_limit_up_stocks(date)
+    if stocks_df is None:
+        raise DataFetchError(date)
+    return stocks_df
+
+@st.cache_data(ttl=UI_DATA_CACHE_TTL, show_spinner=False)
+def load_one_to_two_candidates(date):
+    """按日期缓存的反包数据，供界面使用"""
+    one_to_two_df = get_one_to_two_candidates(date)
+    if one_to_two_df is None:
+        raise DataFetchError(date)
+    return one_to_two_df
+
+# 获取PDF报告（同一份数据和分析结果只生成一次）
+def get_pdf_report(stocks_df, date, analysis_text):
+    """按日期、股票数据和分析内容缓存已生成的PDF报告路径，重新运行时直接复用"""
+    report_key = (date, get_table_snapshot_id(stocks_df), hashlib.sha256(analysis_text.encode('utf-8')).hexdigest())
+    if 'pdf_reports' not in st.session_state:
+        st.session_state.pdf_reports = {}
+    pdf_path = st.session_state.pdf_reports.get(report_key)
+    if pdf_path is None or not os.path.exists(pdf_path):
+        pdf_path = generate_pdf_report(stocks_df, date, analysis_text)
+        st.session_state.pdf_reports[report_key] = pdf_path
+    return pdf_path
+
 # 主应用
 def main():
     st.title("📈 A股连续涨停分析工具")
@@ -560,12 +903,15 @@ def main():
     with tab0:
         st.subheader("🚀 反包（前日涨停，昨日未涨停，今日大概率反包）")
         with st.spinner("正在获取反包数据..."):
-            one_to_two_df = get_one_to_two_candidates(selected_date)
+            try:
+                one_to_two_df = load_one_to_two_candidates(selected_date)
+            except DataFetchError:
+                one_to_two_df = None
         if one_to_two_df is not None and len(one_to_two_df) > 0:
             st.success(f"共找到 {len(one_to_two_df)} 只昨日首板股票")
-            st.dataframe(
-                one_to_two_df.sort_values('进2板概率', ascending=False),
-                use_container_width=True,
+            render_paged_table(
+                one_to_two_df,
+                key="one_to_two_table",
                 column_config={
                     'code': '股票代码',
                     'name': '股票名称',
@@ -574,7 +920,9 @@ def main():
                     'yest_vol': '昨日成交量',
                     '竞昨比': '竞昨比(%)',
                     '进2板概率': '进2板概率标记'
-                }
+                },
+                sort_by=['进2板概率'],
+                ascending=[False]
             )
             st.caption('★为大概率进2板股票，竞昨比=今日竞价量/昨日成交量*100')
         else:
@@ -582,7 +930,10 @@ def main():
     
     # 获取数据
     with st.spinner("正在获取连续涨停数据..."):
-        stocks_df = get_continuous_limit_up_stocks(selected_date)
+        try:
+            stocks_df = load_continuous_limit_up_stocks(selected_date)
+        except DataFetchError:
+            stocks_df = None
     
     # 数据可视化标签页
     with tab1:
@@ -594,15 +945,13 @@ def main():
             
             # 显示原始数据表格
             st.subheader("连续涨停股票列表")
-            st.dataframe(
-                stocks_df[['code', 'name', 'industry', 'limit_up_days']].sort_values('limit_up_days', ascending=False),
-                use_container_width=True,
-                column_config={
-                    'code': '股票代码',
-                    'name': '股票名称',
-                    'industry': '所属概念',
-                    'limit_up_days': '连续涨停天数'
-                }
+            render_paged_table(
+                stocks_df,
+                key="limit_up_table",
+                column_config=LIMIT_UP_COLUMN_CONFIG,
+                sort_by=['limit_up_days'],
+                ascending=[False],
+                sort_presets=LIMIT_UP_SORT_PRESETS
             )
         else:
             st.info(f"{selected_date} 没有连续涨停的股票。")
@@ -633,23 +982,14 @@ def main():
             # 点击分析按钮时执行
             if start_analysis:
                 with st.spinner("DeepSeek AI正在分析行业龙头和跟随股票..."):
-                    # 显示原始数据表格
-                    st.subheader("连续涨停股票数据")
-                    st.dataframe(
-                        stocks_df[['code', 'name', 'industry', 'limit_up_days']].sort_values(['industry', 'limit_up_days'], ascending=[True, False]),
-                        use_container_width=True,
-                        column_config={
-                            'code': '股票代码',
-                            'name': '股票名称',
-                            'industry': '所属概念',
-                            'limit_up_days': '连续涨停天数'
-                        }
-                    )
+                    # 原始数据表格已在数据可视化标签页显示，这里不再重复发送
+                    st.caption(f"分析数据：{len(stocks_df)} 只连续涨停股票，完整列表见「📊 数据可视化」标签页（可选择“按概念分组”排序）")
                     
                     # 获取AI分析结果
                     analysis = analyze_industry_leaders(stocks_df)
                     st.session_state.analysis_result = analysis
                     st.session_state.has_analysis = True
+                    save_analysis_result(selected_date, analysis)
                     
                     # 可视化数据（如果tab1没有执行）
                     if 'fig_pie' not in locals() or 'fig_bar' not in locals():
@@ -665,7 +1005,7 @@ def main():
                     
                     # 生成PDF报告 - 不使用Plotly图表对象
                     with st.spinner("正在生成PDF报告..."):
-                        pdf_path = generate_pdf_report(
+                        pdf_path = get_pdf_report(
                             stocks_df, 
                             selected_date, 
                             analysis
@@ -678,18 +1018,8 @@ def main():
             
             # 如果已经有分析结果，但没有点击分析按钮，显示之前的结果
             elif st.session_state.has_analysis:
-                # 显示原始数据表格
-                st.subheader("连续涨停股票数据")
-                st.dataframe(
-                    stocks_df[['code', 'name', 'industry', 'limit_up_days']].sort_values(['industry', 'limit_up_days'], ascending=[True, False]),
-                    use_container_width=True,
-                    column_config={
-                        'code': '股票代码',
-                        'name': '股票名称',
-                        'industry': '所属概念',
-                        'limit_up_days': '连续涨停天数'
-                    }
-                )
+                # 原始数据表格已在数据可视化标签页显示，这里不再重复发送
+                st.caption(f"分析数据：{len(stocks_df)} 只连续涨停股票，完整列表见「📊 数据可视化」标签页（可选择“按概念分组”排序）")
                 
                 # 显示分析结果
                 st.subheader("DeepSeek AI 分析结果")
@@ -701,7 +1031,7 @@ def main():
                 
                 # 生成PDF报告 - 不使用Plotly图表对象
                 with st.spinner("正在生成PDF报告..."):
-                    pdf_path = generate_pdf_report(
+                    pdf_path = get_pdf_report(
                         stocks_df, 
                         selected_date, 
                         st.session_state.analysis_result